@@ -0,0 +1,343 @@
+/* -*- c-basic-offset: 4 indent-tabs-mode: nil -*-  vi:set ts=8 sts=4 sw=4: */
+
+/*
+    VampyHost
+
+    Use Vamp audio analysis plugins in Python
+
+    Gyorgy Fazekas and Chris Cannam
+    Centre for Digital Music, Queen Mary, University of London
+    Copyright 2008-2015 Queen Mary, University of London
+
+    Permission is hereby granted, free of charge, to any person
+    obtaining a copy of this software and associated documentation
+    files (the "Software"), to deal in the Software without
+    restriction, including without limitation the rights to use, copy,
+    modify, merge, publish, distribute, sublicense, and/or sell copies
+    of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be
+    included in all copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+    EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+    MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+    NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR
+    ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+    CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+    WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+    Except as contained in this notice, the names of the Centre for
+    Digital Music; Queen Mary, University of London; and the authors
+    shall not be used in advertising or otherwise to promote the sale,
+    use or other dealings in this Software without prior written
+    authorization.
+*/
+
+#include "PyFeature.h"
+
+#include "structmember.h"
+
+#include "PyRealTime.h"
+#include "StringConversion.h"
+#include "VectorConversion.h"
+
+#include <string>
+
+using namespace std;
+using namespace Vamp;
+
+PyObject *
+PyFeature_FromFeature(const Plugin::Feature &f)
+{
+    FeatureObject *fo = PyObject_New(FeatureObject, &Feature_Type);
+    if (!fo) return 0;
+
+    fo->timestamp = 0;
+    fo->duration = 0;
+    fo->label = 0;
+    fo->values = 0;
+
+    if (f.hasTimestamp) {
+        fo->timestamp = PyRealTime_FromRealTime(f.timestamp);
+    }
+    if (f.hasDuration) {
+        fo->duration = PyRealTime_FromRealTime(f.duration);
+    }
+
+    fo->label = StringConversion().string2py(f.label);
+
+    if (!f.values.empty()) {
+        fo->values = VectorConversion().PyArray_From_FloatVector(f.values);
+    }
+
+    return (PyObject *)fo;
+}
+
+/* CONSTRUCTOR: New empty Feature with no attributes set. Exists
+   chiefly so that features can be rebuilt when unpickled, e.g. on
+   returning from the process_audio_files worker processes */
+static PyObject *
+PyFeature_new(PyTypeObject *type, PyObject *args, PyObject *kw)
+{
+    if (!PyArg_ParseTuple(args, ":Feature")) return 0;
+
+    FeatureObject *fo = PyObject_New(FeatureObject, &Feature_Type);
+    if (!fo) return 0;
+
+    fo->timestamp = 0;
+    fo->duration = 0;
+    fo->label = 0;
+    fo->values = 0;
+
+    return (PyObject *)fo;
+}
+
+static void
+PyFeature_dealloc(FeatureObject *self)
+{
+    Py_XDECREF(self->timestamp);
+    Py_XDECREF(self->duration);
+    Py_XDECREF(self->label);
+    Py_XDECREF(self->values);
+    PyObject_Del(self);
+}
+
+/* The attributes are fixed C struct slots, giving direct attribute
+   access with far less memory than the per-feature dicts previously
+   returned from process calls. The mapping-style access below is
+   retained for compatibility with code written against those dicts. */
+
+static PyObject **
+featureSlot(FeatureObject *self, PyObject *key)
+{
+    string name = StringConversion().py2string(key);
+    if (PyErr_Occurred()) {
+        PyErr_Clear();
+        return 0;
+    }
+    if (name == "timestamp") return &self->timestamp;
+    if (name == "duration") return &self->duration;
+    if (name == "label") return &self->label;
+    if (name == "values") return &self->values;
+    return 0;
+}
+
+static PyObject *
+PyFeature_subscript(PyObject *self, PyObject *key)
+{
+    PyObject **slot = featureSlot((FeatureObject *)self, key);
+    if (!slot || !*slot) {
+        PyErr_SetObject(PyExc_KeyError, key);
+        return 0;
+    }
+    Py_INCREF(*slot);
+    return *slot;
+}
+
+static int
+PyFeature_ass_subscript(PyObject *self, PyObject *key, PyObject *value)
+{
+    PyObject **slot = featureSlot((FeatureObject *)self, key);
+    if (!slot) {
+        PyErr_SetObject(PyExc_KeyError, key);
+        return -1;
+    }
+    if (!value) { // deletion
+        Py_XDECREF(*slot);
+        *slot = 0;
+        return 0;
+    }
+    Py_INCREF(value);
+    Py_XDECREF(*slot);
+    *slot = value;
+    return 0;
+}
+
+static int
+PyFeature_contains(PyObject *self, PyObject *key)
+{
+    PyObject **slot = featureSlot((FeatureObject *)self, key);
+    return (slot && *slot) ? 1 : 0;
+}
+
+static PyObject *
+featureAsDict(FeatureObject *self)
+{
+    // Dict equivalent of the feature, containing the slots that are
+    // set; used to give == and != the same meaning they had when
+    // process calls returned feature dicts
+    PyObject *d = PyDict_New();
+    if (!d) return 0;
+    if (self->timestamp) {
+        PyDict_SetItemString(d, "timestamp", self->timestamp);
+    }
+    if (self->duration) {
+        PyDict_SetItemString(d, "duration", self->duration);
+    }
+    if (self->label) {
+        PyDict_SetItemString(d, "label", self->label);
+    }
+    if (self->values) {
+        PyDict_SetItemString(d, "values", self->values);
+    }
+    return d;
+}
+
+static PyObject *
+PyFeature_richcompare(PyObject *self, PyObject *other, int op)
+{
+    if (op != Py_EQ && op != Py_NE) {
+        Py_INCREF(Py_NotImplemented);
+        return Py_NotImplemented;
+    }
+
+    PyObject *mine = featureAsDict((FeatureObject *)self);
+    if (!mine) return 0;
+
+    PyObject *theirs;
+    if (PyFeature_Check(other)) {
+        theirs = featureAsDict((FeatureObject *)other);
+    } else {
+        theirs = other;
+        Py_INCREF(theirs);
+    }
+    if (!theirs) {
+        Py_DECREF(mine);
+        return 0;
+    }
+
+    PyObject *result = PyObject_RichCompare(mine, theirs, op);
+    Py_DECREF(mine);
+    Py_DECREF(theirs);
+    return result;
+}
+
+/* Pickle support: rebuild through the empty constructor, then restore
+   the attributes that were set from their dict representation */
+static PyObject *
+PyFeature_reduce(PyObject *self)
+{
+    PyObject *state = featureAsDict((FeatureObject *)self);
+    if (!state) return 0;
+    return Py_BuildValue("(O()N)", (PyObject *)&Feature_Type, state);
+}
+
+static PyObject *
+PyFeature_setstate(PyObject *self, PyObject *state)
+{
+    if (!PyDict_Check(state)) {
+        PyErr_SetString(PyExc_TypeError,
+                        "Feature state must be a dict of attribute values");
+        return 0;
+    }
+    PyObject *key, *value;
+    Py_ssize_t pos = 0;
+    while (PyDict_Next(state, &pos, &key, &value)) {
+        if (PyFeature_ass_subscript(self, key, value) < 0) return 0;
+    }
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+PyFeature_repr(PyObject *self)
+{
+    PyObject *d = featureAsDict((FeatureObject *)self);
+    if (!d) return 0;
+    PyObject *r = PyObject_Repr(d);
+    Py_DECREF(d);
+    return r;
+}
+
+static PyMethodDef PyFeature_methods[] =
+{
+    {"__reduce__", (PyCFunction)PyFeature_reduce, METH_NOARGS,
+     PyDoc_STR("__reduce__() -> Pickle support, reconstructing the feature from the attributes that are set.")},
+
+    {"__setstate__", (PyCFunction)PyFeature_setstate, METH_O,
+     PyDoc_STR("__setstate__(state) -> Pickle support, restoring attributes from their dict representation.")},
+
+    {0, 0}
+};
+
+static PyMemberDef PyFeature_members[] =
+{
+    {(char *)"timestamp", T_OBJECT, offsetof(FeatureObject, timestamp), 0,
+     (char *)"timestamp -> The timestamp of the feature as a RealTime object, if it has one, or None otherwise."},
+
+    {(char *)"duration", T_OBJECT, offsetof(FeatureObject, duration), 0,
+     (char *)"duration -> The duration of the feature as a RealTime object, if it has one, or None otherwise."},
+
+    {(char *)"label", T_OBJECT, offsetof(FeatureObject, label), 0,
+     (char *)"label -> The label of the feature, possibly an empty string."},
+
+    {(char *)"values", T_OBJECT, offsetof(FeatureObject, values), 0,
+     (char *)"values -> The values of the feature as a NumPy array, if it has any, or None otherwise."},
+
+    {0, 0}
+};
+
+static PyMappingMethods PyFeature_as_mapping =
+{
+    0,                        /*mp_length*/
+    PyFeature_subscript,      /*mp_subscript*/
+    PyFeature_ass_subscript,  /*mp_ass_subscript*/
+};
+
+static PySequenceMethods PyFeature_as_sequence =
+{
+    0,                        /*sq_length*/
+    0,                        /*sq_concat*/
+    0,                        /*sq_repeat*/
+    0,                        /*sq_item*/
+    0,                        /*sq_slice*/
+    0,                        /*sq_ass_item*/
+    0,                        /*sq_ass_slice*/
+    PyFeature_contains,       /*sq_contains*/
+};
+
+/* Doc:: 10.3 Type Objects */ /* static */
+PyTypeObject Feature_Type =
+{
+    PyVarObject_HEAD_INIT(NULL, 0)
+    "vampyhost.Feature",                /*tp_name*/
+    sizeof(FeatureObject),              /*tp_basicsize*/
+    0,                                  /*tp_itemsize*/
+    (destructor)PyFeature_dealloc,      /*tp_dealloc*/
+    0,                                  /*tp_print*/
+    0,                                  /*tp_getattr*/
+    0,                                  /*tp_setattr*/
+    0,                                  /*tp_compare*/
+    PyFeature_repr,                     /*tp_repr*/
+    0,                                  /*tp_as_number*/
+    &PyFeature_as_sequence,             /*tp_as_sequence*/
+    &PyFeature_as_mapping,              /*tp_as_mapping*/
+    0,                                  /*tp_hash*/
+    0,                                  /*tp_call*/
+    0,                                  /*tp_str*/
+    PyObject_GenericGetAttr,            /*tp_getattro*/
+    PyObject_GenericSetAttr,            /*tp_setattro*/
+    0,                                  /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT,                 /*tp_flags*/
+    "Feature object, as extracted by a Vamp plugin. Has fixed attributes timestamp, duration, label, and values. Dict-style access with those names as keys is also supported for compatibility with older code, with a key treated as absent when the corresponding attribute is unset.", /*tp_doc*/
+    0,                                  /*tp_traverse*/
+    0,                                  /*tp_clear*/
+    PyFeature_richcompare,              /*tp_richcompare*/
+    0,                                  /*tp_weaklistoffset*/
+    0,                                  /*tp_iter*/
+    0,                                  /*tp_iternext*/
+    PyFeature_methods,                  /*tp_methods*/
+    PyFeature_members,                  /*tp_members*/
+    0,                                  /*tp_getset*/
+    0,                                  /*tp_base*/
+    0,                                  /*tp_dict*/
+    0,                                  /*tp_descr_get*/
+    0,                                  /*tp_descr_set*/
+    0,                                  /*tp_dictoffset*/
+    0,                                  /*tp_init*/
+    0,                                  /*tp_alloc*/
+    PyFeature_new,                      /*tp_new*/
+    0,                                  /*tp_free*/
+    0,                                  /*tp_is_gc*/
+};
@@ -53,6 +53,7 @@
 #include "VectorConversion.h"
 #include "StringConversion.h"
 #include "PyRealTime.h"
+#include "PyFeature.h"
 
 #include "vamp-hostsdk/PluginWrapper.h"
 #include "vamp-hostsdk/PluginInputDomainAdapter.h"
@@ -60,6 +61,7 @@
 #include <string>
 #include <vector>
 #include <cstddef>
+#include <cstring>
 #include <set>
 
 using namespace std;
@@ -131,6 +133,7 @@ PyPluginObject_From_Plugin(Plugin *plugin)
     pd->channels = 0;
     pd->blockSize = 0;
     pd->stepSize = 0;
+    pd->inputBuffers = 0;
     pd->info = 0;
     pd->parameters = 0;
     pd->programs = 0;
@@ -192,11 +195,24 @@ PyPluginObject_From_Plugin(Plugin *plugin)
     return (PyObject *)pd;
 }
 
+static void
+freeInputBuffers(PyPluginObject *pd)
+{
+    if (pd->inputBuffers) {
+        for (size_t c = 0; c < pd->channels; ++c) {
+            delete[] pd->inputBuffers[c];
+        }
+        delete[] pd->inputBuffers;
+        pd->inputBuffers = 0;
+    }
+}
+
 static void
 PyPluginObject_dealloc(PyPluginObject *self)
 {
 //    cerr << "PyPluginObject_dealloc: plugin object " << self << ", plugin " << self->plugin << endl;
 
+    freeInputBuffers(self);
     delete self->plugin;
     Py_XDECREF(self->info);
     Py_XDECREF(self->parameters);
@@ -361,17 +377,35 @@ initialise(PyObject *self, PyObject *args)
     PyPluginObject *pd = getPluginObject(self);
     if (!pd) return 0;
 
+    // The old buffers are gone from here on, so the plugin must not be
+    // treated as initialised again unless we succeed below
+    freeInputBuffers(pd);
+    pd->isInitialised = false;
+
     pd->channels = channels;
     pd->stepSize = stepSize;
     pd->blockSize = blockSize;
 
-    if (!pd->plugin->initialise(channels, stepSize, blockSize)) {
+    bool ok;
+    Py_BEGIN_ALLOW_THREADS
+    ok = pd->plugin->initialise(channels, stepSize, blockSize);
+    Py_END_ALLOW_THREADS
+
+    if (!ok) {
         cerr << "Failed to initialise native plugin adapter with channels = " << channels << ", stepSize = " << stepSize << ", blockSize = " << blockSize << endl;
         PyErr_SetString(PyExc_TypeError,
                         "Plugin initialization failed");
         return 0;
     }
 
+    // One persistent set of input buffers, reused by every process
+    // call: process_block runs once per block and should not have to
+    // go to the allocator each time
+    pd->inputBuffers = new float *[channels];
+    for (ssize_t c = 0; c < channels; ++c) {
+        pd->inputBuffers[c] = new float[blockSize];
+    }
+
     pd->isInitialised = true;
 
     Py_RETURN_TRUE;
@@ -389,7 +423,10 @@ reset(PyObject *self, PyObject *)
         return 0;
     }
         
+    Py_BEGIN_ALLOW_THREADS
     pd->plugin->reset();
+    Py_END_ALLOW_THREADS
+
     Py_RETURN_TRUE;
 }
 
@@ -472,57 +509,98 @@ set_parameter_value(PyObject *self, PyObject *args)
     Py_RETURN_TRUE;
 }
 
+static bool
+setOneParameter(PyPluginObject *pd, const set<string> &paramIds,
+                PyObject *key, PyObject *value)
+{
+#if PY_MAJOR_VERSION >= 3
+    if (!key || !PyUnicode_CheckExact(key)) {
+#else
+    if (!key || !PyString_CheckExact(key)) {
+#endif
+        PyErr_SetString(PyExc_TypeError,
+                        "Parameter keys must all have string type");
+        return false;
+    }
+    if (!value || !FloatConversion::check(value)) {
+        PyErr_SetString(PyExc_TypeError,
+                        "Parameter values must be convertible to float");
+        return false;
+    }
+    StringConversion strconv;
+    string param = strconv.py2string(key);
+    if (paramIds.find(param) == paramIds.end()) {
+        PyErr_SetString(PyExc_Exception,
+                        (string("Unknown parameter id \"") + param + "\"").c_str());
+        return false;
+    }
+    pd->plugin->setParameter(param, FloatConversion::convert(value));
+    return true;
+}
+
 static PyObject *
 set_parameter_values(PyObject *self, PyObject *args)
 {
-    PyObject *dict;
+    PyObject *params;
 
-    if (!PyArg_ParseTuple(args, "O", &dict)) {
+    if (!PyArg_ParseTuple(args, "O", &params)) {
         PyErr_SetString(PyExc_TypeError,
-                        "set_parameter_values() takes dict argument");
+                        "set_parameter_values() takes a dict, or a sequence of (id, value) pairs, argument");
         return 0;
     }
 
-    if (!PyDict_Check(dict)) {
+    bool isDict = PyDict_Check(params);
+    bool isSequence = !isDict && (PyList_Check(params) || PyTuple_Check(params));
+
+    if (!isDict && !isSequence) {
         PyErr_SetString(PyExc_TypeError,
-                        "set_parameter_values() takes dict argument");
+                        "set_parameter_values() takes a dict, or a sequence of (id, value) pairs, argument");
         return 0;
     }
-    
+
     PyPluginObject *pd = getPluginObject(self);
     if (!pd) return 0;
 
+    // Nothing to set is the common case (the high-level interface
+    // passes an empty dict by default): don't enumerate the
+    // parameter descriptors just to find that out
+    if (isDict ? PyDict_Size(params) == 0 : PySequence_Size(params) == 0) {
+        Py_RETURN_TRUE;
+    }
+
     PluginBase::ParameterList pl = pd->plugin->getParameterDescriptors();
     set<string> paramIds;
     for (int i = 0; i < (int)pl.size(); ++i) {
         paramIds.insert(pl[i].identifier);
     }
 
-    Py_ssize_t pos = 0;
-    PyObject *key, *value;
-    while (PyDict_Next(dict, &pos, &key, &value)) {
-#if PY_MAJOR_VERSION >= 3
-        if (!key || !PyUnicode_CheckExact(key)) {
-#else
-        if (!key || !PyString_CheckExact(key)) {
-#endif
-            PyErr_SetString(PyExc_TypeError,
-                            "Parameter dict keys must all have string type");
-            return 0;
-        }
-        if (!value || !FloatConversion::check(value)) {
-            PyErr_SetString(PyExc_TypeError,
-                            "Parameter dict values must be convertible to float");
-            return 0;
+    if (isDict) {
+
+        Py_ssize_t pos = 0;
+        PyObject *key, *value;
+        while (PyDict_Next(params, &pos, &key, &value)) {
+            if (!setOneParameter(pd, paramIds, key, value)) {
+                return 0;
+            }
         }
-        StringConversion strconv;
-        string param = strconv.py2string(key);
-        if (paramIds.find(param) == paramIds.end()) {
-            PyErr_SetString(PyExc_Exception,
-                            (string("Unknown parameter id \"") + param + "\"").c_str());
-            return 0;
+
+    } else {
+
+        Py_ssize_t n = PySequence_Size(params);
+        for (Py_ssize_t i = 0; i < n; ++i) {
+            PyObject *pair = PySequence_GetItem(params, i);
+            if (!pair || !PyTuple_Check(pair) || PyTuple_GET_SIZE(pair) != 2) {
+                Py_XDECREF(pair);
+                PyErr_SetString(PyExc_TypeError,
+                                "Parameter sequence entries must be (id, value) pairs");
+                return 0;
+            }
+            bool ok = setOneParameter(pd, paramIds,
+                                      PyTuple_GET_ITEM(pair, 0),
+                                      PyTuple_GET_ITEM(pair, 1));
+            Py_DECREF(pair);
+            if (!ok) return 0;
         }
-        pd->plugin->setParameter(param, FloatConversion::convert(value));
     }
 
     Py_RETURN_TRUE;
@@ -558,8 +636,6 @@ static
 PyObject *
 convertFeatureSet(const Plugin::FeatureSet &fs)
 {
-    VectorConversion conv;
-    
     PyObject *pyFs = PyDict_New();
 
     for (Plugin::FeatureSet::const_iterator fsi = fs.begin();
@@ -574,28 +650,11 @@ convertFeatureSet(const Plugin::FeatureSet &fs)
 
             for (int fli = 0; fli < (int)fl.size(); ++fli) {
 
-                const Plugin::Feature &f = fl[fli];
-                PyObject *pyF = PyDict_New();
-
-                if (f.hasTimestamp) {
-                    PyObject *rt = PyRealTime_FromRealTime(f.timestamp);
-                    PyDict_SetItemString(pyF, "timestamp", rt);
-                    Py_DECREF(rt);
-                }
-                if (f.hasDuration) {
-                    PyObject *rt = PyRealTime_FromRealTime(f.duration);
-                    PyDict_SetItemString(pyF, "duration", rt);
-                    Py_DECREF(rt);
-                }
-
-                StringConversion strconv;
-
-                setstring(pyF, "label", f.label);
-
-                if (!f.values.empty()) {
-                    PyObject *vv = conv.PyArray_From_FloatVector(f.values);
-                    PyDict_SetItemString(pyF, "values", vv);
-                    Py_DECREF(vv);
+                PyObject *pyF = PyFeature_FromFeature(fl[fli]);
+                if (!pyF) {
+                    Py_DECREF(pyFl);
+                    Py_DECREF(pyFs);
+                    return 0;
                 }
 
                 PyList_SET_ITEM(pyFl, fli, pyF);
@@ -663,10 +722,51 @@ convertPluginInput(PyObject *pyBuffer, int channels, int blockSize)
             return vector<vector<float> >();
         }
     }
-    
+
     return data;
 }
 
+static bool
+fillPluginInput(PyObject *pyBuffer, int channels, int blockSize, float **inbuf)
+{
+    if (PyArray_CheckExact(pyBuffer)) {
+
+        PyArrayObject *pyArray = (PyArrayObject *)pyBuffer;
+
+        // Fast path: a two-dimensional float32 array whose rows are
+        // contiguous (which is what views onto a frame tensor give
+        // us) can be copied straight into the persistent buffers
+        if (PyArray_NDIM(pyArray) == 2 &&
+            PyArray_TYPE(pyArray) == NPY_FLOAT &&
+            PyArray_STRIDE(pyArray, 1) == (npy_intp)sizeof(float)) {
+
+            if ((int)PyArray_DIMS(pyArray)[0] != channels) {
+                PyErr_SetString(PyExc_TypeError, "Wrong number of channels");
+                return false;
+            }
+            if ((int)PyArray_DIMS(pyArray)[1] != blockSize) {
+                PyErr_SetString(PyExc_TypeError, "Wrong number of samples for process block");
+                return false;
+            }
+
+            for (int c = 0; c < channels; ++c) {
+                memcpy(inbuf[c], PyArray_GETPTR2(pyArray, c, 0),
+                       blockSize * sizeof(float));
+            }
+            return true;
+        }
+    }
+
+    vector<vector<float> > data =
+        convertPluginInput(pyBuffer, channels, blockSize);
+    if (data.empty()) return false;
+
+    for (int c = 0; c < channels; ++c) {
+        memcpy(inbuf[c], &data[c][0], blockSize * sizeof(float));
+    }
+    return true;
+}
+
 static PyObject *
 process_block(PyObject *self, PyObject *args)
 {
@@ -694,21 +794,115 @@ process_block(PyObject *self, PyObject *args)
     }
 
     int channels = pd->channels;
-    vector<vector<float> > data =
-        convertPluginInput(pyBuffer, channels, pd->blockSize);
-    if (data.empty()) return 0;
 
-    float **inbuf = new float *[channels];
-    for (int c = 0; c < channels; ++c) {
-        inbuf[c] = &data[c][0];
+    if (!fillPluginInput(pyBuffer, channels, pd->blockSize, pd->inputBuffers)) {
+        return 0;
     }
+
     RealTime timeStamp = *PyRealTime_AsRealTime(pyRealTime);
-    Plugin::FeatureSet fs = pd->plugin->process(inbuf, timeStamp);
-    delete[] inbuf;
+
+    // The plugin's process call is pure native DSP and may be lengthy:
+    // let other Python threads run while it does its work
+    Plugin::FeatureSet fs;
+    float **inbuf = pd->inputBuffers;
+    Py_BEGIN_ALLOW_THREADS
+    fs = pd->plugin->process(inbuf, timeStamp);
+    Py_END_ALLOW_THREADS
 
     return convertFeatureSet(fs);
 }
 
+static PyObject *
+process_strided(PyObject *self, PyObject *args)
+{
+    PyObject *pyBuffer;
+    float rate;
+
+    if (!PyArg_ParseTuple(args, "Of",
+                          &pyBuffer,                    // Audio data
+                          &rate)) {                     // Sample rate
+        PyErr_SetString(PyExc_TypeError,
+                        "process_strided() takes buffer (2D array, one row per channel) and sample rate (float) arguments");
+        return 0; }
+
+    PyPluginObject *pd = getPluginObject(self);
+    if (!pd) return 0;
+
+    if (!pd->isInitialised) {
+        PyErr_SetString(PyExc_Exception,
+                        "Plugin has not been initialised.");
+        return 0;
+    }
+
+    if (!PyArray_CheckExact(pyBuffer)) {
+        PyErr_SetString(PyExc_TypeError,
+                        "process_strided() requires a 2D float32 NumPy array");
+        return 0;
+    }
+
+    PyArrayObject *pyArray = (PyArrayObject *)pyBuffer;
+
+    if (PyArray_NDIM(pyArray) != 2 ||
+        PyArray_TYPE(pyArray) != NPY_FLOAT ||
+        PyArray_STRIDE(pyArray, 1) != (npy_intp)sizeof(float)) {
+        PyErr_SetString(PyExc_TypeError,
+                        "process_strided() requires a two-dimensional float32 array with contiguous rows");
+        return 0;
+    }
+
+    int channels = pd->channels;
+
+    if ((int)PyArray_DIMS(pyArray)[0] != channels) {
+        PyErr_SetString(PyExc_TypeError, "Wrong number of channels");
+        return 0;
+    }
+
+    size_t n = PyArray_DIMS(pyArray)[1];
+    size_t step = pd->stepSize;
+    size_t block = pd->blockSize;
+    size_t nBlocks = (n + step - 1) / step;
+
+    char *base = (char *)PyArray_DATA(pyArray);
+    npy_intp rowStride = PyArray_STRIDE(pyArray, 0);
+
+    Plugin *plugin = pd->plugin;
+    float **inbuf = pd->inputBuffers;
+    Plugin::FeatureSet merged;
+
+    // The whole walk over the buffer is native code: blocks are read
+    // directly from the caller's array with the final ones
+    // zero-padded in our persistent input buffers, so there is no
+    // intermediate frames copy and no Python work per block. Release
+    // the GIL for the duration
+    Py_BEGIN_ALLOW_THREADS
+    for (size_t bi = 0; bi < nBlocks; ++bi) {
+
+        size_t start = bi * step;
+        size_t avail = n - start;
+        if (avail > block) avail = block;
+
+        for (int c = 0; c < channels; ++c) {
+            const float *src = (const float *)(base + c * rowStride) + start;
+            memcpy(inbuf[c], src, avail * sizeof(float));
+            if (avail < block) {
+                memset(inbuf[c] + avail, 0, (block - avail) * sizeof(float));
+            }
+        }
+
+        RealTime timeStamp = RealTime::frame2RealTime(start, rate);
+        Plugin::FeatureSet fs = plugin->process(inbuf, timeStamp);
+
+        for (Plugin::FeatureSet::const_iterator fsi = fs.begin();
+             fsi != fs.end(); ++fsi) {
+            Plugin::FeatureList &fl = merged[fsi->first];
+            fl.insert(fl.end(), fsi->second.begin(), fsi->second.end());
+        }
+    }
+    Py_END_ALLOW_THREADS
+
+    return convertFeatureSet(merged);
+}
+
 static PyObject *
 get_remaining_features(PyObject *self, PyObject *)
 {
@@ -721,7 +915,10 @@ get_remaining_features(PyObject *self, PyObject *)
         return 0;
     }
 
-    Plugin::FeatureSet fs = pd->plugin->getRemainingFeatures();
+    Plugin::FeatureSet fs;
+    Py_BEGIN_ALLOW_THREADS
+    fs = pd->plugin->getRemainingFeatures();
+    Py_END_ALLOW_THREADS
 
     return convertFeatureSet(fs);
 }
@@ -765,11 +962,17 @@ unload(PyObject *self, PyObject *)
     if (!pd) return 0;
 
 //    cerr << "unload: unloading plugin object " << pd << ", plugin " << pd->plugin << endl;
-    
-    delete pd->plugin;
+
+    freeInputBuffers(pd);
+
+    Plugin *plugin = pd->plugin;
     pd->plugin = 0; // This is checked by getPluginObject, so we avoid
                     // blowing up if called repeatedly
 
+    Py_BEGIN_ALLOW_THREADS
+    delete plugin;
+    Py_END_ALLOW_THREADS
+
     Py_RETURN_TRUE;
 }
 
@@ -805,7 +1008,7 @@ static PyMethodDef PyPluginObject_methods[] =
      "set_parameter_value(identifier, value) -> Set the parameter with the given identifier to the given value."},
 
     {"set_parameter_values", set_parameter_values, METH_VARARGS,
-     "set_parameter_values(dict) -> Set multiple parameters to values corresponding to the key/value pairs in the dict. Any parameters not mentioned in the dict are unchanged."},
+     "set_parameter_values(params) -> Set multiple parameters to values corresponding to the key/value pairs in a dict, or to the entries in a sequence of (identifier, value) pairs such as vamp.load.prepare_parameters() returns. Any parameters not mentioned are unchanged."},
     
     {"select_program", select_program, METH_VARARGS,
      "select_program(name) -> Select the processing program with the given name."},
@@ -834,6 +1037,9 @@ static PyMethodDef PyPluginObject_methods[] =
     {"process_block", process_block, METH_VARARGS,
      "process_block(block, timestamp) -> Provide one processing frame to the plugin, with its timestamp, and obtain any features that were extracted immediately from this frame."},
 
+    {"process_strided", process_strided, METH_VARARGS,
+     "process_strided(data, sample_rate) -> Process a whole buffer of audio data in a single call, walking it at the step and block size given to initialise() and zero-padding the final blocks, and return all of the features extracted while doing so, merged per output in block order. The data must be a two-dimensional float32 array with contiguous rows, one row per channel. Features extracted at the end of processing must still be collected with get_remaining_features()."},
+
     {"get_remaining_features", get_remaining_features, METH_NOARGS,
      "get_remaining_features() -> Obtain any features extracted at the end of processing."},
 
@@ -866,7 +1072,7 @@ PyTypeObject Plugin_Type =
     PyObject_GenericSetAttr,            /*tp_setattro*/
     0,                                  /*tp_as_buffer*/
     Py_TPFLAGS_DEFAULT,                 /*tp_flags*/
-    "Plugin object, providing a low-level API for running a Vamp plugin.", /*tp_doc*/
+    "Plugin object, providing a low-level API for running a Vamp plugin. The blocking native calls release the GIL while they run, so separate plugin objects may be used freely from separate threads; but a single plugin object is stateful, and its methods must not be called concurrently from more than one thread.", /*tp_doc*/
     0,                                  /*tp_traverse*/
     0,                                  /*tp_clear*/
     0,                                  /*tp_richcompare*/
@@ -51,6 +51,7 @@ struct PyPluginObject
     size_t channels;
     size_t blockSize;
     size_t stepSize;
+    float **inputBuffers; // reused across process calls; see initialise()
     PyObject *info;
     int inputDomain;
     PyObject *parameters;
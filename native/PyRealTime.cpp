@@ -191,12 +191,26 @@ RealTime_float(PyObject *s)
 }
 
 
+/* Pickle support. Without this, the default pickling reconstructs
+   through RealTime() with no arguments, silently yielding zero time */
+static PyObject *
+RealTime_reduce(PyObject *self)
+{
+    return Py_BuildValue("(O(ii))",
+                         (PyObject *)&RealTime_Type,
+                         ((RealTimeObject*)self)->rt->sec,
+                         ((RealTimeObject*)self)->rt->nsec);
+}
+
 /* Type object's (RealTime) methods table */
-static PyMethodDef RealTime_methods[] = 
+static PyMethodDef RealTime_methods[] =
 {
     {"values", (PyCFunction)RealTime_values,   METH_NOARGS,
      PyDoc_STR("values() -> Tuple of sec,nsec representation.")},
 
+    {"__reduce__", (PyCFunction)RealTime_reduce, METH_NOARGS,
+     PyDoc_STR("__reduce__() -> Pickle support, reconstructing the time from its (sec,nsec) pair.")},
+
     {"to_string", (PyCFunction)RealTime_toString, METH_NOARGS,
      PyDoc_STR("to_string() -> Return a user-readable string to the nearest millisecond in a form like HH:MM:SS.mmm")},
 
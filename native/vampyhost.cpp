@@ -44,6 +44,7 @@
 #include "numpy/arrayobject.h"
 
 #include "PyRealTime.h"
+#include "PyFeature.h"
 #include "PyPluginObject.h"
 
 #include "vamp-hostsdk/PluginHostAdapter.h"
@@ -221,9 +222,15 @@ load_plugin(PyObject *self, PyObject *args)
 
     PluginLoader *loader = PluginLoader::getInstance();
 
-    Plugin *plugin = loader->loadPlugin(pluginKey,
-                                        inputSampleRate,
-                                        adapterFlags);
+    // Loading may hit the disk to open the plugin library: let other
+    // Python threads run while it happens
+    Plugin *plugin;
+    Py_BEGIN_ALLOW_THREADS
+    plugin = loader->loadPlugin(pluginKey,
+                                inputSampleRate,
+                                adapterFlags);
+    Py_END_ALLOW_THREADS
+
     if (!plugin) {
         string pyerr("Failed to load plugin: "); pyerr += pluginKey;
         PyErr_SetString(PyExc_TypeError,pyerr.c_str());
@@ -249,7 +256,46 @@ frame_to_realtime(PyObject *self, PyObject *args)
     RealTime rt = RealTime::frame2RealTime(frame, rate);
     return PyRealTime_FromRealTime(rt);
 }
-    
+
+static PyObject *
+frames_to_realtime(PyObject *self, PyObject *args)
+{
+    ssize_t frame;
+    ssize_t step;
+    ssize_t count;
+    float rate;
+
+    if (!PyArg_ParseTuple(args, "nnnf",
+                          &frame,
+                          &step,
+                          &count,
+                          &rate)) {
+        PyErr_SetString(PyExc_TypeError,
+                        "frames_to_realtime() takes start frame (int), step (int), count (int), and sample rate (float) arguments");
+        return 0; }
+
+    if (count < 0) {
+        PyErr_SetString(PyExc_TypeError,
+                        "frames_to_realtime() takes a non-negative count");
+        return 0;
+    }
+
+    PyObject *pyList = PyList_New(count);
+    if (!pyList) return 0;
+
+    for (ssize_t i = 0; i < count; ++i) {
+        RealTime rt = RealTime::frame2RealTime(frame + i * step, rate);
+        PyObject *pyRt = PyRealTime_FromRealTime(rt);
+        if (!pyRt) {
+            Py_DECREF(pyList);
+            return 0;
+        }
+        PyList_SET_ITEM(pyList, i, pyRt);
+    }
+
+    return pyList;
+}
+
 // module methods table
 static PyMethodDef vampyhost_methods[] = {
     
@@ -274,6 +320,9 @@ static PyMethodDef vampyhost_methods[] = {
     {"frame_to_realtime", frame_to_realtime, METH_VARARGS,
      "frame_to_realtime() -> Convert sample frame number and sample rate to a RealTime object." },
 
+    {"frames_to_realtime", frames_to_realtime, METH_VARARGS,
+     "frames_to_realtime(start_frame, step, count, sample_rate) -> Convert a regular series of sample frame numbers, beginning at start_frame and advancing by step, to a list of count RealTime objects in a single call." },
+
     {0, 0}              /* sentinel */
 };
 
@@ -326,6 +375,7 @@ initvampyhost(void)
 #endif
     
     if (PyType_Ready(&RealTime_Type) < 0) return BAD_RETURN;
+    if (PyType_Ready(&Feature_Type) < 0) return BAD_RETURN;
     if (PyType_Ready(&Plugin_Type) < 0) return BAD_RETURN;
 
 #if (PY_MAJOR_VERSION >= 3)
@@ -342,6 +392,7 @@ initvampyhost(void)
     import_array();
 
     PyModule_AddObject(m, "RealTime", (PyObject *)&RealTime_Type);
+    PyModule_AddObject(m, "Feature", (PyObject *)&Feature_Type);
     PyModule_AddObject(m, "Plugin", (PyObject *)&Plugin_Type);
 
     // Some enum types
@@ -16,7 +16,7 @@ vpydir = 'native/'
 sdkfiles = [ 'Files', 'PluginBufferingAdapter', 'PluginChannelAdapter',
              'PluginHostAdapter', 'PluginInputDomainAdapter', 'PluginLoader',
              'PluginSummarisingAdapter', 'PluginWrapper', 'RealTime' ]
-vpyfiles = [ 'PyPluginObject', 'PyRealTime', 'VectorConversion', 'vampyhost' ]
+vpyfiles = [ 'PyPluginObject', 'PyRealTime', 'PyFeature', 'VectorConversion', 'vampyhost' ]
 
 srcfiles = [
     sdkdir + f + '.cpp' for f in sdkfiles
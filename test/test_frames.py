@@ -20,4 +20,30 @@ def test_frames_from_2d_buffer():
     assert(ff == [[[0,1],[6,7]],[[1,2],[7,8]],[[2,3],[8,9]],
                   [[3,4],[9,10]],[[4,5],[10,11]],[[5,0],[11,0]]])
 
-    
+def tensor_to_lists(t):
+    return to_lists(t[:, i, :] for i in range(t.shape[1]))
+
+def test_tensor_from_1d_buffer():
+    buf = np.arange(6)
+    ff = tensor_to_lists(fr.frames_tensor_from_array(buf, 2, 2))
+    assert(ff == [[[0,1]],[[2,3]],[[4,5]]])
+    ff = tensor_to_lists(fr.frames_tensor_from_array(buf, 1, 2))
+    assert(ff == [[[0,1]],[[1,2]],[[2,3]],[[3,4]],[[4,5]],[[5,0]]])
+
+def test_tensor_from_2d_buffer():
+    buf = np.array([np.arange(6),np.arange(6,12)])
+    ff = tensor_to_lists(fr.frames_tensor_from_array(buf, 2, 2))
+    assert(ff == [[[0,1],[6,7]],[[2,3],[8,9]],[[4,5],[10,11]]])
+    ff = tensor_to_lists(fr.frames_tensor_from_array(buf, 1, 2))
+    assert(ff == [[[0,1],[6,7]],[[1,2],[7,8]],[[2,3],[8,9]],
+                  [[3,4],[9,10]],[[4,5],[10,11]],[[5,0],[11,0]]])
+
+def test_timestamps_seconds():
+    ts = fr.timestamps_seconds(0, 2, 4, 8)
+    assert(list(ts) == [0.0, 0.25, 0.5, 0.75])
+    ts = fr.timestamps_seconds(4, 2, 3, 8)
+    assert(list(ts) == [0.5, 0.75, 1.0])
+    ts = fr.timestamps_seconds(0, 2, 0, 8)
+    assert(list(ts) == [])
+
+
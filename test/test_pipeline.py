@@ -0,0 +1,34 @@
+
+import time
+import warnings
+
+from vamp._pipeline import FramePipeline, prefetch_frames
+
+def test_pipeline_preserves_order():
+    ff = FramePipeline(iter(range(100)), 4).frames()
+    assert(list(ff) == list(range(100)))
+
+def test_prefetch_passthrough_for_short_input():
+    assert(list(prefetch_frames([1, 2, 3])) == [1, 2, 3])
+
+def test_pipeline_propagates_error():
+    def bad():
+        yield 1
+        raise ValueError("boom")
+    try:
+        list(FramePipeline(bad(), 2).frames())
+        assert(False)
+    except ValueError:
+        pass
+
+def test_lossy_pipeline_drops_oldest():
+    p = FramePipeline(iter(range(30)), 2, lossy = True)
+    out = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for f in p.frames():
+            time.sleep(0.15) # outlast the producer's put timeout
+            out.append(f)
+    assert(out == sorted(out))
+    assert(p.dropped > 0)
+    assert(len(out) + p.dropped == 30)
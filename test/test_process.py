@@ -50,6 +50,29 @@ def test_process_multi_summary_param():
     results = list(vamp.process_audio_multiple_outputs(buf, rate, plugin_key, [ "input-summary" ], { "produce_output": 0 }))
     assert len(results) == 0
 
+def test_prepare_parameters():
+    prepared = vamp.prepare_parameters({ "produce_output": 0 })
+    assert prepared == (("produce_output", 0.0),)
+    assert type(prepared[0][1]) == float
+    try:
+        vamp.prepare_parameters({ 3: 1.0 })
+        assert False
+    except TypeError:
+        pass
+    try:
+        vamp.prepare_parameters({ "produce_output": "not a number" })
+        assert False
+    except ValueError:
+        pass
+
+def test_process_summary_prepared_param():
+    # as test_process_summary_param, but passing the pre-converted
+    # parameter settings rather than the dict
+    buf = input_data(blocksize * 10)
+    prepared = vamp.prepare_parameters({ "produce_output": 0 })
+    results = list(vamp.process_audio(buf, rate, plugin_key, "input-summary", prepared))
+    assert len(results) == 0
+
 def test_process_summary_param_bool():
     buf = input_data(blocksize * 10)
     results = list(vamp.process_audio(buf, rate, plugin_key, "input-summary", { "produce_output": False }))
@@ -1,4 +1,6 @@
 
+import pickle
+
 import vampyhost as vh
 import numpy as np
 
@@ -23,6 +25,28 @@ def test_get_set_parameter():
     value = plug.get_parameter_value("produce_output")
     assert(value == 0.0)
     
+def test_set_parameter_values_sequence():
+    plug = vh.load_plugin(plugin_key, rate, vh.ADAPT_NONE)
+    plug.set_parameter_values((("produce_output", 0.0),))
+    assert(plug.get_parameter_value("produce_output") == 0.0)
+    plug.set_parameter_values([]) # nothing to set; should succeed
+    assert(plug.get_parameter_value("produce_output") == 0.0)
+    try:
+        plug.set_parameter_values([("produce_output",)]) # not a pair
+        assert False
+    except TypeError:
+        pass
+    try:
+        plug.set_parameter_values([(1, 2.0)]) # non-string id
+        assert False
+    except TypeError:
+        pass
+    try:
+        plug.set_parameter_values([("produce_output", "no")]) # non-float value
+        assert False
+    except TypeError:
+        pass
+
 def test_process_without_initialise():
     plug = vh.load_plugin(plugin_key, rate, vh.ADAPT_NONE)
     try:
@@ -110,5 +134,21 @@ def test_process_output_3ch():
     result = plug.process_block([[3,0],[4,0],[5,0]], vh.RealTime(0, 0))
     assert (result[9][0]["values"] == np.array([4.0,5.0,6.0])).all()
 
+def test_feature_pickle():
+    plug = vh.load_plugin(plugin_key, rate, vh.ADAPT_NONE)
+    plug.initialise(1, 2, 2)
+    result = plug.process_block([[3,3]], vh.RealTime(0, 0))
+    f = result[9][0]
+    f2 = pickle.loads(pickle.dumps(f))
+    assert f2 == f
+    assert f2["label"] == ""
+    assert (f2["values"] == f["values"]).all()
 
-    
+def test_feature_pickle_direct():
+    f = vh.Feature()
+    f["timestamp"] = vh.RealTime('seconds', 1.5)
+    f["values"] = np.array([5.0])
+    f2 = pickle.loads(pickle.dumps(f))
+    assert f2 == f
+    assert f2["timestamp"] == vh.RealTime('seconds', 1.5)
+    assert "duration" not in f2
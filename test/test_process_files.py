@@ -0,0 +1,39 @@
+
+import vamp
+import numpy as np
+
+plugin_key = "vamp-test-plugin:vamp-test-plugin"
+
+rate = 44100
+
+blocksize = 1024
+
+def load_synthetic(path):
+    # "Loads" a buffer whose length in blocks is encoded in the path,
+    # so these tests need no audio files on disk. Must be defined at
+    # module level so that it can be pickled to the worker processes.
+    n = int(path)
+    return (np.arange(n * blocksize) + 1, rate)
+
+def test_process_files_summary():
+    results = dict(vamp.process_audio_files(
+        [ "10", "3" ], plugin_key, load_synthetic, "input-summary",
+        workers = 2))
+    assert len(results["10"]) == 10
+    assert len(results["3"]) == 3
+    for path in results:
+        for i, f in enumerate(results[path]):
+            # as test_process_summary in test_process.py
+            expected = blocksize + i * blocksize + 1
+            assert f["values"][0] == expected
+
+def test_process_files_timestamps():
+    # The features are pickled back from the worker processes, and the
+    # timestamps must survive that round trip rather than collapse to
+    # zero time
+    (path, features) = next(vamp.process_audio_files(
+        [ "10" ], plugin_key, load_synthetic, "", workers = 1))
+    assert len(features) == 10
+    for i in range(len(features)):
+        expected = vamp.vampyhost.RealTime('seconds', i * 1.5)
+        assert features[i]["timestamp"] == expected
@@ -1,4 +1,6 @@
 
+import pickle
+
 import vamp
 
 def test_basic_conf_compare_sec():
@@ -98,6 +100,23 @@ def test_conv_str():
     r = vamp.vampyhost.RealTime(-1, -500000000)
     assert str(r) == "-1.500000000"
 
+def test_frames_to_realtime():
+    rate = 44100
+    rr = vamp.vampyhost.frames_to_realtime(0, 512, 4, rate)
+    assert len(rr) == 4
+    for i in range(4):
+        assert rr[i] == vamp.vampyhost.frame_to_realtime(i * 512, rate)
+    assert vamp.vampyhost.frames_to_realtime(0, 512, 0, rate) == []
+
+def test_pickle():
+    for r in [ vamp.vampyhost.RealTime(),
+               vamp.vampyhost.RealTime('seconds', 1.5),
+               vamp.vampyhost.RealTime(2, 34),
+               vamp.vampyhost.RealTime(-1, -500000000) ]:
+        r2 = pickle.loads(pickle.dumps(r))
+        assert r == r2
+        assert r.values() == r2.values()
+
 def test_add_subtract():
     r1 = vamp.vampyhost.RealTime('milliseconds', 400)
     r2 = vamp.vampyhost.RealTime('milliseconds', 600)
@@ -110,6 +110,7 @@ This module contains three sorts of function:
    * ``vamp.process_frames``
    * ``vamp.process_audio_multiple_outputs``
    * ``vamp.process_frames_multiple_outputs``
+   * ``vamp.process_audio_files``
 
    These accept audio input, and produce output in the form of a list
    of feature sets structured similarly to those in the C++ Vamp
@@ -122,6 +123,10 @@ This module contains three sorts of function:
    plugin's preferred step and block sizes. The ``_frames`` versions
    instead accept an enumerable sequence of audio frame arrays.
 
+   The ``process_audio_files`` function analyses a set of audio files
+   in parallel across worker processes, using a caller-supplied audio
+   loader, and produces a (path, features) pair per file.
+
 3. The process-and-collect function
 """""""""""""""""""""""""""""""""""
    
@@ -163,7 +168,7 @@ details.
 
 import vampyhost
 
-from vamp.load import list_plugins, get_outputs_of, get_parameters_of, get_category_of
-from vamp.process import process_audio, process_frames, process_audio_multiple_outputs, process_frames_multiple_outputs
+from vamp.load import list_plugins, get_outputs_of, get_parameters_of, get_category_of, prepare_parameters
+from vamp.process import process_audio, process_frames, process_audio_multiple_outputs, process_frames_multiple_outputs, process_audio_files
 from vamp.collect import collect
 
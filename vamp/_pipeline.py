@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+
+#   Python Vamp Host
+#   Copyright (c) 2008-2015 Queen Mary, University of London
+#
+#   Permission is hereby granted, free of charge, to any person
+#   obtaining a copy of this software and associated documentation
+#   files (the "Software"), to deal in the Software without
+#   restriction, including without limitation the rights to use, copy,
+#   modify, merge, publish, distribute, sublicense, and/or sell copies
+#   of the Software, and to permit persons to whom the Software is
+#   furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be
+#   included in all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#   EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#   MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+#   NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+#   CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF
+#   CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+#   WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+#   Except as contained in this notice, the names of the Centre for
+#   Digital Music and Queen Mary, University of London shall not be
+#   used in advertising or otherwise to promote the sale, use or other
+#   dealings in this Software without prior written authorization.
+
+'''Support for overlapping frame preparation with native plugin
+processing. Used by the functions in vamp.process; not part of the
+public API of this module.'''
+
+import threading
+import warnings
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue # Python 2
+
+class FramePipeline(object):
+    """Run a frame source on a separate producer thread, handing its
+    frames on to the consumer through a bounded queue.
+
+    Vamp plugins are stateful, so the process_block calls themselves
+    must remain serial and in input order. What the pipeline overlaps
+    is the preparation of upcoming frames (slicing, padding, type
+    conversion) with the native DSP work for the current one, which
+    runs with the GIL released. Frames are handed on strictly in the
+    order the source produced them.
+
+    The queue depth bounds how far the producer may run ahead of the
+    consumer, and so also bounds the memory held in flight.
+
+    By default no frame is ever discarded: a full queue simply blocks
+    the producer. If lossy is set to True, a producer that finds the
+    queue full instead drops the oldest pending frame to make room,
+    counting the casualties in the dropped attribute. This bounds
+    latency for live sources whose consumer cannot keep up, but the
+    analysis then no longer sees every frame, so it is only meaningful
+    where the consumer can tolerate gaps in the input.
+    """
+
+    _DONE = object()
+
+    def __init__(self, ff, depth = 8, lossy = False):
+        assert(depth > 0)
+        self._queue = queue.Queue(depth)
+        self._stopped = False
+        self._error = None
+        self._lossy = lossy
+        self.dropped = 0
+        self._thread = threading.Thread(target = self._produce, args = (ff,))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _produce(self, ff):
+        try:
+            for f in ff:
+                if not self._offer(f):
+                    return
+        except BaseException as e:
+            self._error = e
+        self._offer(self._DONE)
+
+    def _offer(self, item):
+        # Put item on the queue, giving up if the consumer has stopped
+        # listening; we must not block forever on an abandoned queue
+        while not self._stopped:
+            try:
+                self._queue.put(item, timeout = 0.1)
+                return True
+            except queue.Full:
+                if self._lossy and item is not self._DONE:
+                    self._drop_oldest()
+        return False
+
+    def _drop_oldest(self):
+        # The consumer may have emptied the queue between our failed
+        # put and now, in which case there is nothing to drop
+        try:
+            dropped = self._queue.get_nowait()
+        except queue.Empty:
+            return
+        if dropped is self._DONE: # must never be discarded; requeue it
+            self._queue.put(dropped)
+            return
+        self.dropped = self.dropped + 1
+        if self.dropped % 100 == 1:
+            warnings.warn("Frame consumer falling behind: %d frame(s) "
+                          "dropped so far" % self.dropped)
+
+    def frames(self):
+        """Generate the frames produced by the source, in order. Any
+        exception raised by the source is re-raised here once the
+        frames before it have been consumed."""
+        try:
+            while True:
+                f = self._queue.get()
+                if f is self._DONE:
+                    break
+                yield f
+        finally:
+            self._stopped = True
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+def prefetch_frames(ff, depth = 8, lossy = False):
+    """Iterate over the frames of ff through a FramePipeline, so that
+    frame preparation runs ahead of the consumer on a separate thread.
+    A short sequence with a known length is passed through unchanged,
+    since starting a thread would cost more than it could save.
+
+    If lossy is True, the pipeline drops the oldest pending frame
+    rather than stalling the producer when the consumer falls behind;
+    see FramePipeline for the caveats. The default is lossless."""
+    try:
+        if len(ff) < 32:
+            return iter(ff)
+    except TypeError: # no len for generators; assume long enough
+        pass
+    return FramePipeline(ff, depth, lossy).frames()
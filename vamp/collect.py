@@ -32,7 +32,6 @@
 import vampyhost
 import vamp.load
 import vamp.process
-import vamp.frames
 
 import numpy as np
 
@@ -65,13 +64,9 @@ def timestamp_features(sample_rate, step_size, output_desc, features):
         for f in features:
             yield f
 
-def fill_timestamps(results, sample_rate, step_size, output_desc):
+def fill_timestamps(features, sample_rate, step_size, output_desc):
 
-    output = output_desc["identifier"]
-    
-    selected = ( r[output] for r in results )
-
-    stamped = timestamp_features(sample_rate, step_size, output_desc, selected)
+    stamped = timestamp_features(sample_rate, step_size, output_desc, features)
 
     for s in stamped:
         yield s
@@ -90,20 +85,19 @@ def deduce_shape(output_desc):
     return "matrix"
 
 
-def reshape(results, sample_rate, step_size, output_desc, shape):
+def reshape(features, sample_rate, step_size, output_desc, shape):
 
-    output = output_desc["identifier"]
     out_step = get_feature_step_time(sample_rate, step_size, output_desc)
 
     if shape == "vector":
         rv = ( out_step,
-               np.array([r[output]["values"][0] for r in results], np.float32) )
+               np.array([f["values"][0] for f in features], np.float32) )
     elif shape == "matrix":
         #!!! todo: check that each feature has the right number of bins?
-        outseq = [r[output]["values"] for r in results]
+        outseq = [f["values"] for f in features]
         rv = ( out_step, np.array(outseq, np.float32) )
     else:
-        rv = list(fill_timestamps(results, sample_rate, step_size, output_desc))
+        rv = list(fill_timestamps(features, sample_rate, step_size, output_desc))
 
     return rv
 
@@ -171,12 +165,10 @@ def collect(data, sample_rate, plugin_key, output = "", parameters = {}, **kwarg
     else:
         output_desc = plugin.get_output(output)
 
-    ff = vamp.frames.frames_from_array(data, step_size, block_size)
-
-    results = vamp.process.process_with_initialised_plugin(ff, sample_rate, step_size, plugin, [output])
+    features = vamp.process._process_all(data, sample_rate, plugin, [output])[output]
 
     shape = deduce_shape(output_desc)
-    rv = reshape(results, sample_rate, step_size, output_desc, shape)
+    rv = reshape(features, sample_rate, step_size, output_desc, shape)
 
     plugin.unload()
     return { shape : rv }
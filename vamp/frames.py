@@ -49,3 +49,50 @@ def frames_from_array(arr, step_size, frame_size):
         yield frame
         i = i + step_size
 
+def frames_tensor_from_array(arr, step_size, frame_size):
+    """Return all frames of size frame_size, extracted from the input array
+    arr at step_size intervals, as a single contiguous NumPy array of
+    shape (channels, frames, frame_size), zero-padding the final frames
+    where necessary.
+
+    The result contains the same frames as frames_from_array would
+    generate, but materialised up-front in one backing buffer so that
+    iterating over them afterwards costs only a cheap view per frame.
+    """
+    assert(step_size > 0)
+    if arr.ndim == 1: # turn 1d into 2d array with 1 channel
+        arr = numpy.reshape(arr, (1, arr.shape[0]))
+    assert(arr.ndim == 2)
+    channels = arr.shape[0]
+    n = arr.shape[1]
+    n_frames = (n + step_size - 1) // step_size
+    padded_length = max((n_frames - 1) * step_size + frame_size, n)
+    padded = numpy.zeros((channels, padded_length), dtype = numpy.float32)
+    padded[:, 0:n] = arr
+    # Overlay the padded buffer with a (channels, frames, frame_size)
+    # view whose frame axis advances by step_size, then flatten that
+    # view into a contiguous array: the whole extraction becomes two
+    # bulk native copies, with no Python-level work per frame
+    itemsize = padded.itemsize
+    windows = numpy.lib.stride_tricks.as_strided(
+        padded,
+        shape = (channels, n_frames, frame_size),
+        strides = (padded.strides[0], step_size * itemsize, itemsize))
+    return numpy.ascontiguousarray(windows)
+
+def timestamps_seconds(start_frame, step_size, count, sample_rate):
+    """Return the start times, in seconds, of count frames extracted at
+    step_size intervals beginning at start_frame, as a 1-dimensional
+    float64 NumPy array.
+
+    This is the vectorised counterpart of calling
+    vampyhost.frame_to_realtime for each frame and converting the
+    result with to_float: consumers that only want plain float seconds,
+    rather than RealTime objects, can obtain every timestamp in a
+    single array operation.
+    """
+    assert(step_size > 0)
+    assert(count >= 0)
+    return ((start_frame + step_size * numpy.arange(count))
+            / float(sample_rate))
+
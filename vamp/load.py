@@ -72,6 +72,25 @@ def get_parameters_of(plugin_key):
     plug.unload()
     return params
 
+def prepare_parameters(parameters):
+    """Convert a dictionary of plugin parameter settings into the
+    normalised form used when configuring a plugin: a tuple of
+    (identifier, value) pairs with each value a float, checking the key
+    and value types on the way.
+
+    The result may be passed to any function here that accepts a
+    parameters dictionary. Callers that configure many plugins from the
+    same settings, for example when analysing a large number of short
+    clips, can prepare the parameters once and reuse the result rather
+    than have the dictionary converted afresh for every plugin.
+    """
+    prepared = []
+    for key, value in parameters.items():
+        if not isinstance(key, str):
+            raise TypeError("Parameter keys must all have string type")
+        prepared.append((key, float(value)))
+    return tuple(prepared)
+
 def load_and_configure(data, sample_rate, plugin_key, parameters, **kwargs):
     """Load the plugin with the given plugin key, at a given sample
     rate, configure it with the parameter keys and values in the given
@@ -32,31 +32,151 @@
 import vampyhost
 import vamp.frames
 import vamp.load
+import vamp._pipeline
+
+import numpy
+import os
+
+def _output_index_map(plugin):
+    # Build the identifier-to-index map for all of the plugin's
+    # outputs in a single call: querying get_output once per output id
+    # means one round trip into the extension, and one freshly
+    # allocated descriptor dict, for every id asked about
+    return { o["identifier"]: o["output_index"]
+             for o in plugin.get_outputs() }
+
+
+def _check_init(plugin, channels, step_size, block_size):
+    if not plugin.initialise(channels, step_size, block_size):
+        raise Exception("Failed to initialise plugin with channels = %d, step size = %d, block size = %d" %
+                        (channels, step_size, block_size))
+
+
+def _timed_frames(ff, sample_rate, step_size):
+    # Yield (timestamp, frame) pairs. ff may be either an iterable of
+    # frames, or a tensor as returned by frames.frames_tensor_from_array;
+    # in the latter case each frame is just a view into the tensor's
+    # backing buffer, and since the frame count is known up front, all
+    # of the timestamps can be obtained in a single call rather than
+    # through one Python-to-C round trip per block
+    if isinstance(ff, numpy.ndarray):
+        n_frames = ff.shape[1]
+        timestamps = vampyhost.frames_to_realtime(0, step_size, n_frames, sample_rate)
+        for fi in range(n_frames):
+            yield (timestamps[fi], ff[:, fi, :])
+    else:
+        # Arbitrary frame sources may do real work per frame (slicing,
+        # padding, even decoding), so run them ahead of us on a
+        # prefetch thread: the native process call releases the GIL,
+        # letting the preparation of upcoming frames overlap with it
+        frame_to_realtime = vampyhost.frame_to_realtime
+        fi = 0
+        for f in vamp._pipeline.prefetch_frames(ff):
+            yield (frame_to_realtime(fi, sample_rate), f)
+            fi = fi + step_size
 
-def process_with_initialised_plugin(ff, sample_rate, step_size, plugin, outputs):
 
-    out_indices = dict([(id, plugin.get_output(id)["output_index"])
-                        for id in outputs])
+def _process_single_output(ff, sample_rate, step_size, plugin, output):
+
+    # Specialisation of process_with_initialised_plugin for a single
+    # output, yielding the features themselves rather than wrapping
+    # each one in a dict that the caller would only unwrap again
+
+    out_index = plugin.get_output(output)["output_index"]
     plugin.reset()
-    fi = 0
 
-    for f in ff:
-        timestamp = vampyhost.frame_to_realtime(fi, sample_rate)
-        results = plugin.process_block(f, timestamp)
+    # Hoist the invariant lookup out of the loop: the loop body runs
+    # once per block, and the attribute lookup is surprisingly
+    # expensive in comparison to the work done here
+    process_block = plugin.process_block
+
+    for (timestamp, f) in _timed_frames(ff, sample_rate, step_size):
+        results = process_block(f, timestamp)
         # results is a dict mapping output number -> list of feature dicts
-        for o in outputs:
-            ix = out_indices[o]
-            if ix in results:
-                for r in results[ix]:
-                    yield { o: r }
-        fi = fi + step_size
+        if out_index in results:
+            for r in results[out_index]:
+                yield r
 
     results = plugin.get_remaining_features()
-    for o in outputs:
-        ix = out_indices[o]
-        if ix in results:
-            for r in results[ix]:
-                yield { o: r }
+    if out_index in results:
+        for r in results[out_index]:
+            yield r
+
+
+def _process_multiple_outputs(ff, sample_rate, step_size, plugin, outputs):
+
+    # As _process_single_output, for any number of outputs, yielding
+    # (output id, feature) pairs. Mapping from output index back to id
+    # lets us walk the (small) results dict once per block instead of
+    # testing each requested output against it in turn
+
+    om = _output_index_map(plugin)
+    ix_to_id = { om[oid]: oid for oid in outputs }
+    plugin.reset()
+
+    process_block = plugin.process_block
+
+    for (timestamp, f) in _timed_frames(ff, sample_rate, step_size):
+        results = process_block(f, timestamp)
+        for ix, features in results.items():
+            o = ix_to_id.get(ix)
+            if o is None:
+                continue
+            for r in features:
+                yield (o, r)
+
+    results = plugin.get_remaining_features()
+    for ix, features in results.items():
+        o = ix_to_id.get(ix)
+        if o is None:
+            continue
+        for r in features:
+            yield (o, r)
+
+
+def _process_all(data, sample_rate, plugin, outputs):
+
+    # Run the whole of the given audio data through the plugin and
+    # return a dict mapping output id to a flat list of features, in
+    # processing order. This is for vamp.collect(), which wants all of
+    # the features at once: rather than stream blocks through the
+    # generator machinery it hands the audio to the plugin's fused
+    # whole-buffer process call, which walks it natively
+
+    om = _output_index_map(plugin)
+    ix_to_id = { om[oid]: oid for oid in outputs }
+    plugin.reset()
+
+    if data.ndim == 1: # turn 1d into 2d array with 1 channel
+        data = numpy.reshape(data, (1, data.shape[0]))
+    buf = numpy.ascontiguousarray(data, dtype = numpy.float32)
+
+    acc = { oid: [] for oid in outputs }
+
+    results = plugin.process_strided(buf, sample_rate)
+    for ix, features in results.items():
+        o = ix_to_id.get(ix)
+        if o is not None:
+            acc[o].extend(features)
+
+    results = plugin.get_remaining_features()
+    for ix, features in results.items():
+        o = ix_to_id.get(ix)
+        if o is not None:
+            acc[o].extend(features)
+
+    return acc
+
+
+def process_with_initialised_plugin(ff, sample_rate, step_size, plugin, outputs):
+
+    if len(outputs) == 1:
+        output = outputs[0]
+        for r in _process_single_output(ff, sample_rate, step_size, plugin, output):
+            yield { output: r }
+    else:
+        for (o, r) in _process_multiple_outputs(ff, sample_rate, step_size, plugin, outputs):
+            yield { o: r }
 
 
 def process_audio(data, sample_rate, plugin_key, output = "", parameters = {}, **kwargs):
@@ -97,10 +217,10 @@ def process_audio(data, sample_rate, plugin_key, output = "", parameters = {}, *
     if output == "":
         output = plugin.get_output(0)["identifier"]
 
-    ff = vamp.frames.frames_from_array(data, step_size, block_size)
+    ff = vamp.frames.frames_tensor_from_array(data, step_size, block_size)
 
-    for r in process_with_initialised_plugin(ff, sample_rate, step_size, plugin, [output]):
-        yield r[output]
+    for r in _process_single_output(ff, sample_rate, step_size, plugin, output):
+        yield r
     
     plugin.unload()
 
@@ -139,42 +259,99 @@ def process_frames(ff, sample_rate, step_size, plugin_key, output = "", paramete
                                    vampyhost.ADAPT_BUFFER_SIZE +
                                    vampyhost.ADAPT_CHANNEL_COUNT)
 
-    fi = 0
-    channels = 0
-    block_size = 0
-
     if output == "":
         out_index = 0
     else:
         out_index = plugin.get_output(output)["output_index"]
-    
-    for f in ff:
-
-        if fi == 0:
-            channels = f.shape[0]
-            block_size = f.shape[1]
-            plugin.set_parameter_values(parameters)
-            if not plugin.initialise(channels, step_size, block_size):
-                raise "Failed to initialise plugin"
 
-        timestamp = vampyhost.frame_to_realtime(fi, sample_rate)
-        results = plugin.process_block(f, timestamp)
-        # results is a dict mapping output number -> list of feature dicts
+    # Run the frame source ahead of us on a prefetch thread: the
+    # native process call releases the GIL, letting the preparation of
+    # upcoming frames overlap with it
+    it = vamp._pipeline.prefetch_frames(ff)
+    try:
+        f = next(it)
+    except StopIteration:
+        plugin.unload()
+        return
+
+    # The first frame determines the shape-dependent setup, so handle
+    # it in this prologue: the main loop below then runs with no
+    # first-block test in it
+    channels = f.shape[0]
+    block_size = f.shape[1]
+    plugin.set_parameter_values(parameters)
+    _check_init(plugin, channels, step_size, block_size)
+
+    process_block = plugin.process_block
+    frame_to_realtime = vampyhost.frame_to_realtime
+
+    results = process_block(f, frame_to_realtime(0, sample_rate))
+    # results is a dict mapping output number -> list of feature dicts
+    if out_index in results:
+        for r in results[out_index]:
+            yield r
+
+    fi = step_size
+
+    for f in it:
+        timestamp = frame_to_realtime(fi, sample_rate)
+        results = process_block(f, timestamp)
         if out_index in results:
             for r in results[out_index]:
                 yield r
-
         fi = fi + step_size
 
-    if fi > 0:
-        results = plugin.get_remaining_features()
-        if out_index in results:
-            for r in results[out_index]:
-                yield r
-        
+    results = plugin.get_remaining_features()
+    if out_index in results:
+        for r in results[out_index]:
+            yield r
+
     plugin.unload()
     
 
+def _process_one_file(job):
+    (path, loader, plugin_key, output, parameters, kwargs) = job
+    (data, sample_rate) = loader(path)
+    return (path, list(process_audio(data, sample_rate, plugin_key, output, parameters, **kwargs)))
+
+
+def process_audio_files(paths, plugin_key, loader, output = "", parameters = {}, workers = None, **kwargs):
+    """Process a number of audio files with a Vamp plugin, spreading the
+    files across a pool of worker processes, and make the results
+    available as a generator of (path, features) pairs in the order the
+    paths were given.
+
+    Each plugin instance is private to one file in one worker process,
+    so the files are analysed entirely independently and throughput
+    scales with the number of workers. The workers argument gives the
+    pool size; if it is None, one worker per processor core is used.
+
+    No code for loading audio files is included in this module, so a
+    loader callable must be supplied. It is called with one of the
+    given paths and must return a (data, sample_rate) pair suitable for
+    vamp.process_audio(). Since it is dispatched to worker processes,
+    it must be picklable - a function defined at module level rather
+    than a lambda or closure.
+
+    The output, parameters, and any keyword arguments are passed along
+    to vamp.process_audio() for every file; the features for each file
+    are returned as a list rather than a generator, since they are
+    shipped back whole from the worker.
+    """
+
+    from concurrent import futures # deferred: not available on Python 2
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    jobs = [(path, loader, plugin_key, output, parameters, kwargs)
+            for path in paths]
+
+    with futures.ProcessPoolExecutor(max_workers = workers) as pool:
+        for result in pool.map(_process_one_file, jobs):
+            yield result
+
+
 def process_audio_multiple_outputs(data, sample_rate, plugin_key, outputs, parameters = {}, **kwargs):
     """Process audio data with a Vamp plugin, and make the results from a
     set of plugin outputs available as a generator.
@@ -207,7 +384,7 @@ def process_audio_multiple_outputs(data, sample_rate, plugin_key, outputs, param
 
     plugin, step_size, block_size = vamp.load.load_and_configure(data, sample_rate, plugin_key, parameters, **kwargs)
 
-    ff = vamp.frames.frames_from_array(data, step_size, block_size)
+    ff = vamp.frames.frames_tensor_from_array(data, step_size, block_size)
 
     for r in process_with_initialised_plugin(ff, sample_rate, step_size, plugin, outputs):
         yield r
@@ -246,40 +423,63 @@ def process_frames_multiple_outputs(ff, sample_rate, step_size, plugin_key, outp
                                    vampyhost.ADAPT_BUFFER_SIZE +
                                    vampyhost.ADAPT_CHANNEL_COUNT)
 
-    out_indices = dict([(id, plugin.get_output(id)["output_index"])
-                        for id in outputs])
-    
-    fi = 0
-    channels = 0
-    block_size = 0
-
-    for f in ff:
-
-        if fi == 0:
-            channels = f.shape[0]
-            block_size = f.shape[1]
-            plugin.set_parameter_values(parameters)
-            if not plugin.initialise(channels, step_size, block_size):
-                raise "Failed to initialise plugin"
-
-        timestamp = vampyhost.frame_to_realtime(fi, sample_rate)
-        results = plugin.process_block(f, timestamp)
-        # results is a dict mapping output number -> list of feature dicts
-        for o in outputs:
-            ix = out_indices[o]
-            if ix in results:
-                for r in results[ix]:
-                    yield { o: r }
+    # Mapping from output index back to id lets us walk the (small)
+    # results dict once per block instead of testing each requested
+    # output against it in turn
+    om = _output_index_map(plugin)
+    ix_to_id = { om[oid]: oid for oid in outputs }
+
+    # Run the frame source ahead of us on a prefetch thread: the
+    # native process call releases the GIL, letting the preparation of
+    # upcoming frames overlap with it
+    it = vamp._pipeline.prefetch_frames(ff)
+    try:
+        f = next(it)
+    except StopIteration:
+        plugin.unload()
+        return
+
+    # The first frame determines the shape-dependent setup, so handle
+    # it in this prologue: the main loop below then runs with no
+    # first-block test in it
+    channels = f.shape[0]
+    block_size = f.shape[1]
+    plugin.set_parameter_values(parameters)
+    _check_init(plugin, channels, step_size, block_size)
+
+    process_block = plugin.process_block
+    frame_to_realtime = vampyhost.frame_to_realtime
+
+    results = process_block(f, frame_to_realtime(0, sample_rate))
+    # results is a dict mapping output number -> list of feature dicts
+    for ix, features in results.items():
+        o = ix_to_id.get(ix)
+        if o is None:
+            continue
+        for r in features:
+            yield { o: r }
+
+    fi = step_size
+
+    for f in it:
+        timestamp = frame_to_realtime(fi, sample_rate)
+        results = process_block(f, timestamp)
+        for ix, features in results.items():
+            o = ix_to_id.get(ix)
+            if o is None:
+                continue
+            for r in features:
+                yield { o: r }
         fi = fi + step_size
 
-    if fi > 0:
-        results = plugin.get_remaining_features()
-        for o in outputs:
-            ix = out_indices[o]
-            if ix in results:
-                for r in results[ix]:
-                    yield { o: r }
-        
+    results = plugin.get_remaining_features()
+    for ix, features in results.items():
+        o = ix_to_id.get(ix)
+        if o is None:
+            continue
+        for r in features:
+            yield { o: r }
+
     plugin.unload()
 
 